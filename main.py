@@ -2,15 +2,15 @@
 主入口文件
 启动 service 服务
 """
-import os
 import sys
 import time
 
-from eth_account import Account
-from hyperliquid.exchange import Exchange
-from hyperliquid.utils.constants import MAINNET_API_URL
-
-from src.data.exchange_manager import create_okx_exchange, create_hyperliquid_exchange
+from src.data.exchange_manager import (
+    create_okx_exchange,
+    create_hyperliquid_exchange,
+    load_markets_cached,
+    must_env,
+)
 from src.data.models import RegimeState
 from src.core.engine import start_trade
 from dotenv import load_dotenv
@@ -20,14 +20,32 @@ def main() -> None:
 
     load_dotenv()
     try:
+        # 启动即校验必需环境变量：坏配置 1 秒内失败，而不是等到第一个交易周期
+        for key in ("HL_PRIVATE_KEY", "HL_WALLET_ADDRESS"):
+            must_env(key)
+
         okx_exchange = create_okx_exchange()
-        okx_exchange.load_markets()
+        # 市场表走磁盘缓存：频繁重启时跳过 1-2s 的全量拉取
+        load_markets_cached(okx_exchange)
         hyperliquid = create_hyperliquid_exchange()
+
+        # 状态机跨周期复用：prev_base 用于 regime 迟滞判断，不能每轮重建
+        state = RegimeState()
+
+        # 绝对期限调度：固定节奏，不受 start_trade 执行耗时影响（不漂移）
+        period = 60.0
+        next_tick = time.monotonic()
         while True:
 
-            state = RegimeState()
             start_trade(hyperliquid,okx_exchange,state)
-            time.sleep(60)
+
+            next_tick += period
+            sleep_for = next_tick - time.monotonic()
+            if sleep_for > 0:
+                time.sleep(sleep_for)
+            else:
+                # 本轮超时（执行比周期还慢），直接对齐到下一个期限
+                next_tick = time.monotonic()
     except KeyboardInterrupt:
         print("\n\n⚠️  用户中断程序")
         sys.exit(0)
@@ -1,4 +1,9 @@
-from typing import Any, Dict, List, Optional, Iterable
+import asyncio
+import functools
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
 from hyperliquid.info import Info
 
@@ -7,15 +12,16 @@ from src.data.models import (
     AccountOverview,
     AccountState,
     MarginSummary,
-    NormalOrder,
     PerpPosition,
     PositionOrders,
     Side,
-    TriggerOrder,
 )
 from src.tools.performance import measure_time
 from datetime import datetime, timezone
 
+# 账户接口 I/O 专用线程池：两个 REST 请求并发发出
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
 
 
 
@@ -151,8 +157,27 @@ def fetch_account_overview(info: Info, address: str,primary_symbol: Optional[str
     """
     print("\n💼 正在获取账户状态...")
 
-    us = info.user_state(address)
+    # user_state 和 frontend_open_orders 互相独立，并发发出：
+    # 总耗时从 t1+t2 降到 max(t1, t2)。
+    # （代价是零仓位时多一次挂单请求，但省掉的串行等待远大于它）
+    fut_us = _EXECUTOR.submit(info.user_state, address)
+    fut_orders = _EXECUTOR.submit(info.frontend_open_orders, address)
+
+    us = fut_us.result()
+    frontend_open_orders = fut_orders.result() or []
+
+    return _build_account_overview(us, frontend_open_orders, primary_symbol)
 
+
+def _build_account_overview(
+    us: Dict[str, Any],
+    frontend_open_orders: Any,
+    primary_symbol: Optional[str] = None,
+) -> AccountOverview:
+    """
+    把原始 user_state / frontend_open_orders 解析成 AccountOverview。
+    拆出来是为了让同步/异步两个入口共用同一套解析逻辑。
+    """
     # --- summary ---
     cross_margin_summary = MarginSummary.from_dict(us.get("crossMarginSummary"))
     margin_summary = MarginSummary.from_dict(us.get("marginSummary"))
@@ -168,20 +193,14 @@ def fetch_account_overview(info: Info, address: str,primary_symbol: Optional[str
     # --- positions ---
     asset_positions = us.get("assetPositions") or []
     positions: List[PerpPosition] = []
-    primary_position: Optional[PerpPosition] = None
     for ap in asset_positions:
         pos_dict = ap.get("position")
         coin = pos_dict.get("coin")
         if not coin:
             continue
-        pos = PerpPosition.from_dict(pos_dict)
-        positions.append(pos)
-
-        if primary_symbol is not None and coin == primary_symbol:
-           primary_position = pos
+        positions.append(PerpPosition.from_dict(pos_dict))
 
     # --- orders ---
-    frontend_open_orders = info.frontend_open_orders(address) or []
     if not isinstance(frontend_open_orders, list):
         frontend_open_orders = []
 
@@ -191,12 +210,11 @@ def fetch_account_overview(info: Info, address: str,primary_symbol: Optional[str
     # ✅ 内嵌到仓位对象里
     positions = embed_orders_into_positions(positions, normal_orders, trigger_orders)
 
-    # ✅ primary_position 如果需要也要从 enriched 里重新拿（否则它是老对象）
-    if primary_symbol is not None:
-        for p in positions:
-            if p.coin == primary_symbol:
-                primary_position = p
-                break
+    # ✅ coin -> 仓位索引：一次构建，后续按币种查找都是 O(1)
+    by_coin: Dict[str, PerpPosition] = {p.coin: p for p in positions}
+
+    # ✅ primary_position 从 enriched 索引里拿（订单已内嵌）
+    primary_position = by_coin.get(primary_symbol) if primary_symbol is not None else None
 
     return AccountOverview(
         state=state,
@@ -204,9 +222,28 @@ def fetch_account_overview(info: Info, address: str,primary_symbol: Optional[str
         open_orders=frontend_open_orders,
         primary_position=primary_position,
         raw_user_state=us,
+        positions_by_coin=by_coin,
     )
 
 
+async def fetch_account_overview_async(
+    info: Info,
+    address: str,
+    primary_symbol: Optional[str] = None,
+) -> AccountOverview:
+    """
+    fetch_account_overview 的异步版本：
+    user_state 和 frontend_open_orders 是两次互相独立的 REST 请求，
+    用 asyncio.gather 并发发出，总耗时从 t1+t2 降到 max(t1, t2)。
+    SDK 本身是同步的，这里用 to_thread 包一层即可。
+    """
+    us, frontend_open_orders = await asyncio.gather(
+        asyncio.to_thread(info.user_state, address),
+        asyncio.to_thread(info.frontend_open_orders, address),
+    )
+    return _build_account_overview(us, frontend_open_orders, primary_symbol)
+
+
 def _fmt(x: Optional[float], nd: int = 4) -> str:
     if x is None:
         return "-"
@@ -223,6 +260,21 @@ def _fmt_pct(x: Optional[float], nd: int = 2) -> str:
     except Exception:
         return str(x)
 
+# 热路径专用格式化：小数位固定、只判 None，不走通用版的 try/except
+def _fmt2(x: Optional[float]) -> str:
+    return "-" if x is None else f"{x:.2f}"
+
+
+def _fmt4(x: Optional[float]) -> str:
+    return "-" if x is None else f"{x:.4f}"
+
+
+def _fmt6(x: Optional[float]) -> str:
+    return "-" if x is None else f"{x:.6f}"
+
+
+# 同一批订单的时间戳每个周期都重复出现，缓存格式化结果
+@functools.lru_cache(maxsize=512)
 def _fmt_ts_ms(ts_ms: Optional[int]) -> str:
     if ts_ms is None:
         return "-"
@@ -243,64 +295,74 @@ def format_account_overview(
     将 fetch_account_overview() 的结果格式化成可读文本。
     ⚠️ 不会打印 overview.raw_user_state（按你的要求）。
     """
-    lines: List[str] = []
+    # StringIO 缓冲：直接往一块缓冲区里写，省掉 lines 列表 + 末尾 join 的二次拷贝
+    buf = io.StringIO()
+    w = buf.write
 
     st = overview.state
     ts = st.time_ms
     if ts is not None:
         # HL time_ms 是毫秒时间戳（UTC）
         dt_utc = datetime.fromtimestamp(ts / 1000.0, tz=timezone.utc)
-        lines.append(f"账户概览（UTC 时间）：{dt_utc.strftime('%Y-%m-%d %H:%M:%S')}")
+        w(f"账户概览（UTC 时间）：{dt_utc.strftime('%Y-%m-%d %H:%M:%S')}\n")
     else:
-        lines.append("账户概览")
+        w("账户概览\n")
 
     cms = st.cross_margin_summary
     acct = cms.account_value
     used = cms.total_margin_used
     util = (used / acct) if (acct is not None and used is not None and acct != 0) else None
 
-    lines.append("========== 账户/保证金 ==========")
-    lines.append(f"- 账户权益(USDC)          ：{_fmt(acct, 4)}")
-    lines.append(f"- 总保证金占用(USDC)      ：{_fmt(used, 4)}")
-    lines.append(f"- 保证金占用率            ：{_fmt_pct(util, 2)}")
-    lines.append(f"- 总名义仓位价值(USDC)    ：{_fmt(cms.total_ntl_pos, 4)}")
-    lines.append(f"- 总原始盈亏(USDC)        ：{_fmt(cms.total_raw_usd, 4)}")
-    lines.append(f"- 可提余额(USDC)          ：{_fmt(st.withdrawable, 4)}")
-    lines.append(f"- 全仓维持保证金占用(USDC)：{_fmt(st.cross_maintenance_margin_used, 4)}")
-
-    # positions
-    positions = [p for p in (overview.positions or []) if (p.szi is None or abs(p.szi) > 0)]
-    lines.append("")
-    lines.append(f"========== 仓位列表（非零）: {len(positions)} ==========")
-    if not positions:
-        lines.append("- （无持仓）")
-
-    for i, p in enumerate(positions[:max_positions]):
+    w("========== 账户/保证金 ==========\n")
+    w(f"- 账户权益(USDC)          ：{_fmt4(acct)}\n")
+    w(f"- 总保证金占用(USDC)      ：{_fmt4(used)}\n")
+    w(f"- 保证金占用率            ：{_fmt_pct(util, 2)}\n")
+    w(f"- 总名义仓位价值(USDC)    ：{_fmt4(cms.total_ntl_pos)}\n")
+    w(f"- 总原始盈亏(USDC)        ：{_fmt4(cms.total_raw_usd)}\n")
+    w(f"- 可提余额(USDC)          ：{_fmt4(st.withdrawable)}\n")
+    w(f"- 全仓维持保证金占用(USDC)：{_fmt4(st.cross_maintenance_margin_used)}\n")
+
+    # positions：单次遍历，边数非零仓位边收集前 max_positions 个（不建完整中间列表）
+    total_nonzero = 0
+    shown: List[PerpPosition] = []
+    for p in overview.positions or []:
+        if p.szi is not None and abs(p.szi) <= 0:
+            continue
+        total_nonzero += 1
+        if len(shown) < max_positions:
+            shown.append(p)
+
+    w("\n")
+    w(f"========== 仓位列表（非零）: {total_nonzero} ==========\n")
+    if not shown:
+        w("- （无持仓）\n")
+
+    for i, p in enumerate(shown):
         lev = p.leverage
         orders: Optional[PositionOrders] = p.orders
         tp_n = len(orders.tpsl.tp) if orders is not None else 0
         sl_n = len(orders.tpsl.sl) if orders is not None else 0
         norm_n = len(orders.normal) if orders is not None else 0
 
-        if p.side_enum == Side.LONG:
+        if p.side_enum is Side.LONG:
             side_cn = "多"
-        elif p.side_enum == Side.SHORT:
+        elif p.side_enum is Side.SHORT:
             side_cn = "空"
         else:
             side_cn = "无"
         lev_type_cn = "全仓" if lev.type == "cross" else ("逐仓" if lev.type == "isolated" else "-")
 
-        lines.append(f"- [{i+1:02d}] 币种：{p.coin}")
-        lines.append(f"    方向：{side_cn}    数量(szi)：{_fmt(p.szi, 6)}")
-        lines.append(f"    开仓均价：{_fmt(p.entry_px, 2)}    预估强平价：{_fmt(p.liquidation_px, 2)}")
-        lines.append(
-            f"    保证金占用：{_fmt(p.margin_used, 4)}    名义价值：{_fmt(p.position_value, 2)}"
+        w(f"- [{i+1:02d}] 币种：{p.coin}\n")
+        w(f"    方向：{side_cn}    数量(szi)：{_fmt6(p.szi)}\n")
+        w(f"    开仓均价：{_fmt2(p.entry_px)}    预估强平价：{_fmt2(p.liquidation_px)}\n")
+        w(
+            f"    保证金占用：{_fmt4(p.margin_used)}    名义价值：{_fmt2(p.position_value)}\n"
         )
-        lines.append(
-            f"    未实现盈亏：{_fmt(p.unrealized_pnl, 4)}    ROE：{_fmt(p.return_on_equity, 4)}"
+        w(
+            f"    未实现盈亏：{_fmt4(p.unrealized_pnl)}    ROE：{_fmt4(p.return_on_equity)}\n"
         )
-        lines.append(
-            f"    杠杆：{_fmt(lev.value, 2)}x（{lev_type_cn}）    关联订单：TP/SL/普通 = {tp_n}/{sl_n}/{norm_n}"
+        w(
+            f"    杠杆：{_fmt2(lev.value)}x（{lev_type_cn}）    关联订单：TP/SL/普通 = {tp_n}/{sl_n}/{norm_n}\n"
         )
 
         # 打印“仓位内嵌的订单”（而不是 overview.open_orders 原始 dict 列表）
@@ -312,43 +374,45 @@ def format_account_overview(
         per_pos_cap = 13
 
         # --- TP / SL（TriggerOrder）---
-        tp_list: List[TriggerOrder] = list(pos_orders.tpsl.tp)
-        sl_list: List[TriggerOrder] = list(pos_orders.tpsl.sl)
+        # tuple 本身就能迭代/切片，不必 list(...) 拷贝一份
+        tp_list = pos_orders.tpsl.tp
+        sl_list = pos_orders.tpsl.sl
 
         if tp_list:
-            lines.append(f"    止盈单(TP)：{len(tp_list)}（最多展示 {per_pos_cap}）")
+            w(f"    止盈单(TP)：{len(tp_list)}（最多展示 {per_pos_cap}）\n")
             for j, o in enumerate(tp_list[:per_pos_cap]):
-                lines.append(
-                    f"      - [{j+1:02d}] 方向={o.side} 数量={_fmt(o.size, 6)} "
-                    f"触发价={_fmt(o.trigger_px, 2)} 执行限价={_fmt(o.limit_px, 2)} "
-                    f"时间={_fmt_ts_ms(o.timestamp)}"
+                w(
+                    f"      - [{j+1:02d}] 方向={o.side} 数量={_fmt6(o.size)} "
+                    f"触发价={_fmt2(o.trigger_px)} 执行限价={_fmt2(o.limit_px)} "
+                    f"时间={_fmt_ts_ms(o.timestamp)}\n"
                 )
         if sl_list:
-            lines.append(f"    止损单(SL)：{len(sl_list)}（最多展示 {per_pos_cap}）")
+            w(f"    止损单(SL)：{len(sl_list)}（最多展示 {per_pos_cap}）\n")
             for j, o in enumerate(sl_list[:per_pos_cap]):
-                lines.append(
-                    f"      - [{j+1:02d}] 方向={o.side} 数量={_fmt(o.size, 6)} "
-                    f"触发价={_fmt(o.trigger_px, 2)} 执行限价={_fmt(o.limit_px, 2)} "
-                    f"时间={_fmt_ts_ms(o.timestamp)}"
+                w(
+                    f"      - [{j+1:02d}] 方向={o.side} 数量={_fmt6(o.size)} "
+                    f"触发价={_fmt2(o.trigger_px)} 执行限价={_fmt2(o.limit_px)} "
+                    f"时间={_fmt_ts_ms(o.timestamp)}\n"
                 )
         # others 不一定是 tp/sl，先不打印（需要再加）
 
         # --- 普通单（NormalOrder）---
-        normal_list: List[NormalOrder] = list(pos_orders.normal)
+        normal_list = pos_orders.normal
         if normal_list:
-            lines.append(f"    普通挂单：{len(normal_list)}（最多展示 {per_pos_cap}）")
+            w(f"    普通挂单：{len(normal_list)}（最多展示 {per_pos_cap}）\n")
             for j, o in enumerate(normal_list[:per_pos_cap]):
-                lines.append(
-                    f"      - [{j+1:02d}] 方向={o.side} 数量={_fmt(o.size, 6)} "
-                    f"限价={_fmt(o.limit_px, 2)} 时间={_fmt_ts_ms(o.timestamp)}"
+                w(
+                    f"      - [{j+1:02d}] 方向={o.side} 数量={_fmt6(o.size)} "
+                    f"限价={_fmt2(o.limit_px)} 时间={_fmt_ts_ms(o.timestamp)}\n"
                 )
-    if len(positions) > max_positions:
-        lines.append(f"- ...（还有 {len(positions) - max_positions} 个仓位未展示）")
+    if total_nonzero > max_positions:
+        w(f"- ...（还有 {total_nonzero - max_positions} 个仓位未展示）\n")
 
     # 注意：按要求不使用 overview.open_orders（避免 raw dict 刷屏），
     # 挂单/止盈止损统一从 positions[i].orders / positions[i].orders.tpsl 读取并打印。
 
-    return "\n".join(lines)
+    # 每行写入时都带了 \n，这里去掉最后一个，保持和原来 "\n".join 一样不带尾换行
+    return buf.getvalue()[:-1]
 
 
 def print_account_overview(
@@ -359,5 +423,8 @@ def print_account_overview(
 ) -> None:
     """
     打印 fetch_account_overview() 的结果（不打印 raw_user_state）。
+    整段文本一次性写出：一次 write 系统调用，而不是逐行 print。
     """
-    print(format_account_overview(overview, max_positions=max_positions, max_orders=max_orders))
+    sys.stdout.write(
+        format_account_overview(overview, max_positions=max_positions, max_orders=max_orders) + "\n"
+    )
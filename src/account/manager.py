@@ -4,7 +4,8 @@
 """
 from __future__ import annotations
 
-from dataclasses import replace
+import operator
+from collections import defaultdict
 from typing import Any, Dict, Optional, List, Tuple
 
 from src.data.models import Side, PerpPosition, NormalOrder, TriggerOrder, PositionTpsl, PositionOrders
@@ -12,39 +13,44 @@ from src.tools.utils import _to_float
 
 
 def _to_int(x: Any) -> Optional[int]:
+    # 快路径：时间戳字段基本都已经是 int，直接判类型比 try/except 便宜
+    if type(x) is int:
+        return x
+    if x is None:
+        return None
     try:
-        if x is None:
-            return None
         return int(x)
     except Exception:
         return None
 
 
-def _is_trigger_order(o: Dict[str, Any]) -> bool:
-    # 你给的规则：isTrigger 或 orderType == "Trigger"
-    return bool(o.get("isTrigger", False)) or (o.get("orderType") == "Trigger")
-
-
 def parse_orders(all_orders: List[Dict[str, Any]]) -> Tuple[List[NormalOrder], List[TriggerOrder]]:
     normal_orders: List[NormalOrder] = []
     trigger_orders: List[TriggerOrder] = []
 
+    # 热路径：把方法/构造器绑定成局部名，省掉每条订单重复的属性查找
+    normal_append = normal_orders.append
+    trigger_append = trigger_orders.append
+    to_float = _to_float
+    to_int = _to_int
+
     for o in all_orders or []:
-        coin = str(o.get("coin") or "")
+        get = o.get
+        coin = str(get("coin") or "")
         if not coin:
             continue
 
-        side = o.get("side") or o.get("dir")  # 'B'/'A' or 'buy'/'sell'
-        sz = _to_float(o.get("sz")) or 0.0
-
-        limit_px = _to_float(o.get("limitPx") or o.get("price"))
-        trig_px = _to_float(o.get("triggerPx"))  # HL 常见字段
-        trig_cond = o.get("triggerCondition")
+        side = get("side") or get("dir")  # 'B'/'A' or 'buy'/'sell'
+        sz = to_float(get("sz")) or 0.0
 
-        ts = _to_int(o.get("timestamp") or o.get("time") or o.get("t"))
+        limit_px = to_float(get("limitPx") or get("price"))
+        ts = to_int(get("timestamp") or get("time") or get("t"))
 
-        if _is_trigger_order(o):
-            trigger_orders.append(
+        # 判定规则：isTrigger 或 orderType == "Trigger"（内联，避免一次函数调用）
+        if get("isTrigger", False) or get("orderType") == "Trigger":
+            trig_px = to_float(get("triggerPx"))  # HL 常见字段
+            trig_cond = get("triggerCondition")
+            trigger_append(
                 TriggerOrder(
                     coin=coin,
                     side=str(side) if side is not None else None,
@@ -52,13 +58,13 @@ def parse_orders(all_orders: List[Dict[str, Any]]) -> Tuple[List[NormalOrder], L
                     limit_px=limit_px,
                     trigger_px=trig_px,
                     trigger_condition=str(trig_cond) if trig_cond is not None else None,
-                    is_position_tpsl=bool(o.get("isPositionTpsl", False)),
+                    is_position_tpsl=bool(get("isPositionTpsl", False)),
                     timestamp=ts,
                     raw=o,
                 )
             )
         else:
-            normal_orders.append(
+            normal_append(
                 NormalOrder(
                     coin=coin,
                     side=str(side) if side is not None else None,
@@ -89,24 +95,39 @@ def split_tpsl_for_position(
     entry = pos.entry_px
     side = pos.side_enum
 
-    tp: List[TriggerOrder] = []
-    sl: List[TriggerOrder] = []
-    others: List[TriggerOrder] = []
+    # 仓位级条件只判一次：entry 缺失或方向未知时全部归 others，直接返回
+    if entry is None or side not in (Side.LONG, Side.SHORT):
+        return PositionTpsl(tp=(), sl=(), others=tuple(trigger_orders_same_coin))
 
-    for o in trigger_orders_same_coin:
-        ref = _order_ref_price(o)
-        if entry is None or ref is None or side not in (Side.LONG, Side.SHORT):
-            others.append(o)
-            continue
+    # 分类时顺手带上 ref 价（装饰元组），排序阶段直接复用，不再重算
+    tp: List[Tuple[float, TriggerOrder]] = []
+    sl: List[Tuple[float, TriggerOrder]] = []
+    others: List[TriggerOrder] = []
 
-        if side == Side.LONG:
-            (tp if ref > entry else sl).append(o)
-        else:  # Side.SHORT
-            (tp if ref < entry else sl).append(o)
+    # 按方向拆成两个专用循环，循环体内不再重复判断 side
+    if side is Side.LONG:
+        for o in trigger_orders_same_coin:
+            ref = _order_ref_price(o)
+            if ref is None:
+                others.append(o)
+            else:
+                (tp if ref > entry else sl).append((ref, o))
+    else:  # Side.SHORT
+        for o in trigger_orders_same_coin:
+            ref = _order_ref_price(o)
+            if ref is None:
+                others.append(o)
+            else:
+                (tp if ref < entry else sl).append((ref, o))
 
     # 你要可读一点的话，排序一下（tp 按价从低到高，sl 按价从低到高）
-    tp_sorted = tuple(sorted(tp, key=lambda x: (_order_ref_price(x) or 0.0)))
-    sl_sorted = tuple(sorted(sl, key=lambda x: (_order_ref_price(x) or 0.0)))
+    # 0/1 条订单时排序没有意义（常见场景就是一条 TP 一条 SL）
+    if len(tp) > 1:
+        tp.sort(key=operator.itemgetter(0))
+    if len(sl) > 1:
+        sl.sort(key=operator.itemgetter(0))
+    tp_sorted = tuple(o for _, o in tp)
+    sl_sorted = tuple(o for _, o in sl)
     others_sorted = tuple(others)
 
     return PositionTpsl(tp=tp_sorted, sl=sl_sorted, others=others_sorted)
@@ -116,38 +137,36 @@ def embed_orders_into_positions(
     normal_orders: List[NormalOrder],
     trigger_orders: List[TriggerOrder],
 ) -> List[PerpPosition]:
-    # 先按 coin 分桶
-    norm_by_coin: Dict[str, List[NormalOrder]] = {}
-    trig_by_coin: Dict[str, List[TriggerOrder]] = {}
+    # 先按 coin 分桶：defaultdict 省掉 setdefault 每次新建空列表的开销，
+    # 且只收持仓币种的订单（无仓位的币种后面也不会用到）
+    held = {p.coin for p in positions}
+    norm_by_coin: Dict[str, List[NormalOrder]] = defaultdict(list)
+    trig_by_coin: Dict[str, List[TriggerOrder]] = defaultdict(list)
 
     for o in normal_orders:
-        norm_by_coin.setdefault(o.coin, []).append(o)
+        if o.coin in held:
+            norm_by_coin[o.coin].append(o)
 
     for o in trigger_orders:
-        trig_by_coin.setdefault(o.coin, []).append(o)
+        if o.coin in held:
+            trig_by_coin[o.coin].append(o)
 
-    enriched: List[PerpPosition] = []
     for pos in positions:
         coin = pos.coin
-        coin_trigs = trig_by_coin.get(coin, [])
-        coin_norms = norm_by_coin.get(coin, [])
+        coin_trigs = trig_by_coin.get(coin, ())
+        coin_norms = norm_by_coin.get(coin, ())
 
         tpsl = split_tpsl_for_position(pos, coin_trigs)
 
-        orders = PositionOrders(
+        # PerpPosition 不是 frozen：原地挂上 orders，
+        # 省掉 dataclasses.replace 整个对象的拷贝
+        pos.orders = PositionOrders(
             tpsl=tpsl,
             normal=tuple(coin_norms),
             raw_trigger=tuple(coin_trigs),
         )
 
-        enriched.append(replace(pos, orders=orders))
-
-    return enriched
-
-from typing import Optional, List
-
-def order_ref_price(o: "TriggerOrder") -> Optional[float]:
-    return o.trigger_px if o.trigger_px is not None else o.limit_px
+    return positions
 
 def position_stop_price(pos: "PerpPosition") -> Optional[float]:
     """从内嵌 tpsl.sl 里取当前有效止损价（最紧的那条）"""
@@ -156,15 +175,15 @@ def position_stop_price(pos: "PerpPosition") -> Optional[float]:
     sl_orders = pos.orders.tpsl.sl or ()
     prices: List[float] = []
     for o in sl_orders:
-        px = order_ref_price(o)
+        px = _order_ref_price(o)
         if px is not None:
             prices.append(float(px))
     if not prices:
         return None
 
-    if pos.side_enum == Side.LONG:
+    if pos.side_enum is Side.LONG:
         return max(prices)   # 多单：最紧止损=最高那条
-    if pos.side_enum == Side.SHORT:
+    if pos.side_enum is Side.SHORT:
         return min(prices)   # 空单：最紧止损=最低那条
     return None
 
@@ -6,13 +6,14 @@ from __future__ import annotations
 
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 
 from hyperliquid.exchange import Exchange
 import ccxt
 from src.account.account import fetch_account_overview, print_account_overview
 from src.data.fetcher import ohlcv_to_df, fetch_order_book_info, build_perp_asset_map
-from src.data.indicators import compute_technical_factors
+from src.data.indicators import compute_technical_factors_cached
 from src.data.analyzer import classify_trend_range, classify_timing_state
 from src.data.models import RegimeState, PerpAssetInfo, Decision, TimingState
 from src.strategy.regime import classify_vol_state, decide_regime
@@ -30,39 +31,62 @@ LEVERAGE = 5.0
 
 MAX_SPREAD_BPS = 2.0
 
+# 行情 I/O 线程池：三路 K 线 / 盘口 / 资产元数据互相独立，并发拉取
+FETCH_MAX_WORKERS = 5
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS)
+
+# 钱包地址整个进程生命周期不变，首次使用后缓存，避免每个周期都查环境变量
+_HL_ADDRESS: str | None = None
+
+
+def _wallet_address() -> str | None:
+    global _HL_ADDRESS
+    if _HL_ADDRESS is None:
+        _HL_ADDRESS = os.environ.get("HL_WALLET_ADDRESS")
+    return _HL_ADDRESS
+
 
 @measure_time
 def start_trade(exchange: Exchange,okx_exchange: ccxt.okx, state: RegimeState) -> None:
 
-    account_overview = fetch_account_overview(exchange.info, os.environ.get("HL_WALLET_ADDRESS"), SYMBOL)
+    # 行情请求互相独立：先全部并发发出，拿结果时再逐个等待
+    fut_1h = _FETCH_EXECUTOR.submit(candles_last_n_closed, exchange.info, SYMBOL, "1h", limit=500)
+    fut_15m = _FETCH_EXECUTOR.submit(
+        candles_last_n_closed, exchange.info, SYMBOL, "15m", limit=500, safety_ms=30000
+    )
+    fut_5m = _FETCH_EXECUTOR.submit(
+        candles_last_n_closed, exchange.info, SYMBOL, "5m", limit=500, safety_ms=30000
+    )
+    fut_order_book = _FETCH_EXECUTOR.submit(fetch_order_book_info, exchange.info, SYMBOL)
+    fut_asset_map = _FETCH_EXECUTOR.submit(build_perp_asset_map, exchange, ["ETH", "BTC", "SOL"])
+
+    account_overview = fetch_account_overview(exchange.info, _wallet_address(), SYMBOL)
     print_account_overview(account_overview)
-    df_1h = ohlcv_to_df(hl_candles_to_ohlcv_list(
-        candles_last_n_closed(exchange.info, SYMBOL, "1h", limit=500)
-    ))
-    df_15m = ohlcv_to_df(hl_candles_to_ohlcv_list(
-        candles_last_n_closed(exchange.info, SYMBOL, "15m", limit=500, safety_ms=30000)
-    ))
-    df_5m = ohlcv_to_df(hl_candles_to_ohlcv_list(
-        candles_last_n_closed(exchange.info, SYMBOL, "5m", limit=500, safety_ms=30000)
-    ))
-
-    # 计算技术指标
-    indicators_1h = compute_technical_factors(df_1h)
-    indicators_15m = compute_technical_factors(df_15m)
-    indicators_5m = compute_technical_factors(df_5m)
+    df_1h = ohlcv_to_df(hl_candles_to_ohlcv_list(fut_1h.result()))
+    df_15m = ohlcv_to_df(hl_candles_to_ohlcv_list(fut_15m.result()))
+    df_5m = ohlcv_to_df(hl_candles_to_ohlcv_list(fut_5m.result()))
+
+    # 计算技术指标（按时间帧缓存：同一根未收盘 bar 内不重算）
+    # 三个时间帧互相独立，丢进线程池并行算：pandas/numpy 内核大多释放 GIL
+    fut_ind_1h = _FETCH_EXECUTOR.submit(compute_technical_factors_cached, df_1h, "1h")
+    fut_ind_15m = _FETCH_EXECUTOR.submit(compute_technical_factors_cached, df_15m, "15m")
+    # 5m 只被用作触发确认（atr_14 + 原始 OHLC），走 light 档省掉 HV/POC 等重计算
+    indicators_5m = compute_technical_factors_cached(df_5m, "5m", profile="light")
+    indicators_1h = fut_ind_1h.result()
+    indicators_15m = fut_ind_15m.result()
 
     # 1h：环境/方向/权限
     base, adx = classify_trend_range(df=indicators_1h, prev=state.prev_base)
     vol_state, vol_dbg = classify_vol_state(indicators_1h)
     timing:TimingState = classify_timing_state(indicators_1h)
 
-    order_book = fetch_order_book_info(exchange.info, SYMBOL)
+    order_book = fut_order_book.result()
     regime: Decision = decide_regime(
         base, adx, vol_state, order_book,
         timing=timing,
         max_spread_bps=MAX_SPREAD_BPS
     )
-    perp_asset_map: Dict[str, PerpAssetInfo] = build_perp_asset_map(exchange, ["ETH", "BTC", "SOL"])
+    perp_asset_map: Dict[str, PerpAssetInfo] = fut_asset_map.result()
     asset_info = perp_asset_map.get(SYMBOL)
     if asset_info is None:
         print(f"⚠️ asset_info missing for {SYMBOL}")
@@ -4,6 +4,7 @@
 """
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 from src.data.models import MarketRegime, TimingState, SlopeState, Slope
@@ -28,11 +29,13 @@ def classify_trend_range(
     if df is None or "adx_14" not in df.columns:
         return MarketRegime.UNKNOWN, None
 
-    s = df["adx_14"].dropna()
-    if len(s) < 50:
+    # ndarray 路径：isnan 掩码替代 dropna 的 Series 拷贝（只需要有效样本数和最后一个值）
+    arr = df["adx_14"].to_numpy(dtype=np.float64, copy=False)
+    vals = arr[~np.isnan(arr)]
+    if len(vals) < 50:
         return MarketRegime.UNKNOWN, None
 
-    adx = float(s.iloc[-1])
+    adx = float(vals[-1])
 
     # ---------- Hysteresis ----------
     # 如果上一状态是 TREND：只有明显走弱才退出
@@ -56,32 +59,34 @@ def classify_trend_range(
     return MarketRegime.MIXED, adx
 
 
+# 无分支编码：(cur > eps) - (cur < -eps) ∈ {1, -1, 0}，查表映射到枚举
+_SLOPE_BY_CODE = {1: Slope.UP, -1: Slope.DOWN, 0: Slope.FLAT}
+
+
+def _slope_state(series: Optional[pd.Series], window: int, k: float) -> SlopeState:
+    if series is None:
+        return SlopeState(state=Slope.UNKNOWN, cur=None, eps=None)
+
+    # ndarray 路径：isnan 掩码替代 dropna 的 Series 拷贝
+    arr = series.to_numpy(dtype=np.float64, copy=False)
+    vals = arr[~np.isnan(arr)]
+    if len(vals) < window:
+        return SlopeState(state=Slope.UNKNOWN, cur=None, eps=None)
+
+    w = vals[-window:]
+    cur = float(w[-1])
+    std = float(w.std(ddof=1))
+    eps = std * k if std > 0 else 0.0
+
+    st = _SLOPE_BY_CODE[(cur > eps) - (cur < -eps)]
+    return SlopeState(state=st, cur=cur, eps=eps)
+
+
 def classify_timing_state(df: pd.DataFrame, window: int = 200, k: float = 0.2) -> TimingState:
     """
     判断时机状态（ADX斜率、BBW斜率）
     """
-    def _state(series: Optional[pd.Series]) -> SlopeState:
-        if series is None:
-            return SlopeState(state=Slope.UNKNOWN, cur=None, eps=None)
-        
-        s = series.dropna()
-        if len(s) < window:
-            return SlopeState(state=Slope.UNKNOWN, cur=None, eps=None)
-        
-        w = s.iloc[-window:]
-        cur = float(w.iloc[-1])
-        std = float(w.std())
-        eps = std * k if std > 0 else 0.0
-        
-        if cur > eps:
-            st = Slope.UP
-        elif cur < -eps:
-            st = Slope.DOWN
-        else:
-            st = Slope.FLAT
-        return SlopeState(state=st, cur=cur, eps=eps)
-
     return TimingState(
-        adx_slope=_state(df.get("adx_slope")),
-        bbw_slope=_state(df.get("bbw_slope")),
+        adx_slope=_slope_state(df.get("adx_slope"), window, k),
+        bbw_slope=_slope_state(df.get("bbw_slope"), window, k),
     )
@@ -5,16 +5,118 @@
 from eth_account import Account
 from hyperliquid.exchange import Exchange
 from hyperliquid.utils.constants import MAINNET_API_URL
+import functools
+import json
 import os
+import time
 import ccxt
 import sys
-from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
 
 # 配置信息
 
+def _patch_ccxt_orjson() -> None:
+    """
+    把 ccxt 的响应解析换成 orjson：
+    ccxt 每个 REST 响应都过 Exchange.parse_json（标准库 json），
+    行情/仓位负载几十 KB 时 orjson 快 3-5 倍。
+    解析失败或未安装 orjson 时走 ccxt 原实现。
+    """
+    try:
+        import orjson
+        from ccxt.base.exchange import Exchange as _CcxtExchange
+    except ImportError:
+        return
+
+    _orig_parse_json = _CcxtExchange.parse_json
+
+    def _parse_json(self, http_response):
+        try:
+            return orjson.loads(http_response)
+        except Exception:
+            # 非 UTF-8 / 非法 JSON：回退 ccxt 原逻辑（含其容错语义）
+            return _orig_parse_json(self, http_response)
+
+    _CcxtExchange.parse_json = _parse_json
+
+
+_patch_ccxt_orjson()
+
+
+def _mount_pooled_adapter(session: "requests.Session") -> None:
+    """
+    给 requests.Session 挂载连接池适配器：
+    复用 TCP/TLS 连接（keep-alive），避免每次请求重新握手
+    """
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def _bind_orjson_json(session: "requests.Session") -> None:
+    """
+    只在这个 Session 的响应上用 orjson 解析 JSON（response 钩子把实例级
+    json 换掉），不碰全局 requests.Response —— 进程里其他 requests 用户
+    的 .json(**kwargs) 语义保持原样。未安装 orjson 时不做任何事。
+    """
+    try:
+        import orjson
+    except ImportError:
+        return
+
+    def _hook(resp, **kwargs):
+        resp.json = lambda **kw: orjson.loads(resp.content)
+        return resp
+
+    session.hooks["response"].append(_hook)
+
+
+def _make_http2_session(timeout: float = 20.0):
+    """
+    构建 HTTP/2 的 httpx.Client 替代 SDK 默认的 requests.Session：
+    多路复用让一批并发的独立请求（user_state / 挂单 / K线 / 元数据）
+    共享同一条 TLS 连接，消除队头阻塞。
+    装了 orjson 时响应走 orjson 解析（user_state / K线负载几百 KB，
+    C 实现快一个量级）；带参数的 .json(**kwargs) 调用保持 httpx 原语义。
+    缺少 httpx / h2 时返回 None，调用方回退到 requests 连接池。
+    """
+    try:
+        import httpx
+    except ImportError:
+        return None
+
+    try:
+        import orjson
+    except ImportError:
+        client_cls = httpx.Client
+    else:
+
+        class _OrjsonResponse(httpx.Response):
+            def json(self, **kwargs):
+                if kwargs:
+                    return super().json(**kwargs)
+                return orjson.loads(self.content)
+
+        class _OrjsonClient(httpx.Client):
+            def send(self, *args, **kwargs):
+                resp = super().send(*args, **kwargs)
+                resp.__class__ = _OrjsonResponse
+                return resp
+
+        client_cls = _OrjsonClient
+
+    return client_cls(
+        http2=True,
+        timeout=timeout,
+        limits=httpx.Limits(max_keepalive_connections=8),
+    )
+
+@functools.lru_cache(maxsize=1)
 def create_okx_exchange() -> ccxt.okx:
     """
-    创建交易所实例
+    创建交易所实例（进程内单例：重复调用返回同一个连接实例）
 
     Args:
         api_key: API密钥
@@ -49,9 +151,10 @@ def create_okx_exchange() -> ccxt.okx:
         sys.exit(1)
 
 
+@functools.lru_cache(maxsize=1)
 def create_hyperliquid_exchange() -> "Exchange":
     """
-    创建 Hyperliquid 交易所实例
+    创建 Hyperliquid 交易所实例（进程内单例：重复调用返回同一个连接实例）
 
     Returns:
         Exchange: Hyperliquid 交易所实例
@@ -63,8 +166,54 @@ def create_hyperliquid_exchange() -> "Exchange":
             account_address=must_env("HL_WALLET_ADDRESS"),
             timeout=20.0,
         )
+
+    # SDK 内部用 requests.Session 发请求：优先换成 HTTP/2 的 httpx.Client
+    # （多路复用），否则退回带连接池的 requests 适配器（keep-alive）
+    for client in (exchange, getattr(exchange, "info", None)):
+        session = getattr(client, "session", None)
+        if session is None:
+            continue
+        h2 = _make_http2_session()
+        if h2 is not None:
+            client.session = h2
+        else:
+            _mount_pooled_adapter(session)
+            _bind_orjson_json(session)
+
     return exchange
 
+# 市场元数据（symbol/精度表）变化很慢，落盘缓存跳过每次启动 1-2s 的全量拉取
+_MARKETS_CACHE_TTL_S = 3600.0
+
+
+def load_markets_cached(exchange, ttl_seconds: float = _MARKETS_CACHE_TTL_S) -> dict:
+    """
+    带磁盘缓存的 load_markets：
+
+    - 缓存文件在 TTL 内：直接 set_markets 灌入快照（ccxt 官方入口，
+      顺带填好 symbols / markets_by_id），跳过 HTTP 拉取
+    - 缓存缺失/过期/损坏：照常 load_markets，成功后回写缓存
+
+    缓存读写失败都静默回退到网络路径，不影响启动。
+    """
+    path = f".markets_{exchange.id}.json"
+    try:
+        if time.time() - os.stat(path).st_mtime < ttl_seconds:
+            with open(path) as fh:
+                exchange.set_markets(json.load(fh))
+            return exchange.markets
+    except (OSError, ValueError):
+        pass
+
+    markets = exchange.load_markets()
+    try:
+        with open(path, "w") as fh:
+            json.dump(markets, fh)
+    except (OSError, TypeError):
+        pass
+    return markets
+
+
 def must_env(key: str) -> str:
     v = os.environ.get(key)
     if not v:
@@ -4,9 +4,10 @@
 """
 from __future__ import annotations
 
+import time
 from typing import List, Optional, Dict, Iterable, Any
-from decimal import Decimal
 
+import numpy as np
 import pandas as pd
 from hyperliquid.info import Info
 
@@ -19,10 +20,23 @@ def ohlcv_to_df(ohlcv: List[List[float]]) -> pd.DataFrame:
     将 ccxt 返回的 ohlcv 列表转换为 pandas DataFrame：
     columns = [timestamp, open, high, low, close, volume]
     """
-    df = pd.DataFrame(ohlcv, columns=["timestamp", "open", "high", "low", "close", "volume"])
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True).dt.tz_convert('Asia/Shanghai')
-    df.set_index("timestamp", inplace=True)
-    return df
+    # 整块转成 float64 矩阵再按列切：pandas 不用逐行推断类型，
+    # 也省掉先建 timestamp 列再 set_index 的中间拷贝
+    arr = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+    index = pd.DatetimeIndex(
+        pd.to_datetime(arr[:, 0].astype(np.int64), unit="ms", utc=True),
+        name="timestamp",
+    ).tz_convert('Asia/Shanghai')
+    return pd.DataFrame(
+        {
+            "open": arr[:, 1],
+            "high": arr[:, 2],
+            "low": arr[:, 3],
+            "close": arr[:, 4],
+            "volume": arr[:, 5],
+        },
+        index=index,
+    )
 
 
 @measure_time
@@ -72,27 +86,19 @@ def fetch_order_book_info(info: Info, symbol: str, depth_pct: float = 0.005) ->
         min_bid_threshold = mid_price * (1 - depth_pct)
         max_ask_threshold = mid_price * (1 + depth_pct)
 
-        # --- 计算买盘深度 ---
-        current_bid_depth_val = 0.0
-        for item in raw_bids:
-            p = float(item['px'])
-            q = float(item['sz'])
+        # --- 向量化：整档位转 ndarray，searchsorted 找截断位，dot 一次算完 px*sz 之和 ---
+        bid_px = np.fromiter((float(item['px']) for item in raw_bids), dtype=np.float64, count=len(raw_bids))
+        bid_sz = np.fromiter((float(item['sz']) for item in raw_bids), dtype=np.float64, count=len(raw_bids))
+        ask_px = np.fromiter((float(item['px']) for item in raw_asks), dtype=np.float64, count=len(raw_asks))
+        ask_sz = np.fromiter((float(item['sz']) for item in raw_asks), dtype=np.float64, count=len(raw_asks))
 
-            if p < min_bid_threshold:
-                break
+        # bids 价格降序：取反后升序，找到第一个跌破阈值的位置
+        bid_cut = int(np.searchsorted(-bid_px, -min_bid_threshold, side='right'))
+        # asks 价格升序：直接找第一个超过阈值的位置
+        ask_cut = int(np.searchsorted(ask_px, max_ask_threshold, side='right'))
 
-            current_bid_depth_val += p * q
-
-        # --- 计算卖盘深度 ---
-        current_ask_depth_val = 0.0
-        for item in raw_asks:
-            p = float(item['px'])
-            q = float(item['sz'])
-
-            if p > max_ask_threshold:
-                break
-
-            current_ask_depth_val += p * q
+        current_bid_depth_val = float(np.dot(bid_px[:bid_cut], bid_sz[:bid_cut]))
+        current_ask_depth_val = float(np.dot(ask_px[:ask_cut], ask_sz[:ask_cut]))
 
         # 5. 计算不平衡度 (Imbalance)
         total_depth = current_bid_depth_val + current_ask_depth_val
@@ -117,15 +123,20 @@ def fetch_order_book_info(info: Info, symbol: str, depth_pct: float = 0.005) ->
         return None
 
 
-def safe_decimal(x: Any, default: str = "0") -> Decimal:
+def safe_float(x: Any, default: float = 0.0) -> float:
     """
-    安全转换为 Decimal：
+    安全转换为 float：
     - None / 空值 → default
-    - str / int / float → Decimal
+    - str / int / float → float
     """
     if x is None:
-        return Decimal(default)
-    return Decimal(str(x))
+        return default
+    return float(x)
+
+
+# (白名单) -> (构建时间, asset_map)：meta/ctx 快照短时间内重复请求意义不大
+_ASSET_MAP_TTL_S = 5.0
+_ASSET_MAP_CACHE: Dict[Optional[frozenset], tuple[float, Dict[str, PerpAssetInfo]]] = {}
 
 
 @measure_time
@@ -147,15 +158,21 @@ def build_perp_asset_map(
       ...
     }
     """
+    # 允许列表：统一转成 set，O(1) 判断
+    allowed_set = frozenset(allowed_symbols) if allowed_symbols is not None else None
+
+    # 0) TTL 缓存：几秒内的重复调用直接复用上一次快照
+    now = time.monotonic()
+    cached = _ASSET_MAP_CACHE.get(allowed_set)
+    if cached is not None and now - cached[0] < _ASSET_MAP_TTL_S:
+        return cached[1]
+
     # 1) 一次性请求交易所快照
     meta, asset_ctxs = exchange.info.meta_and_asset_ctxs()
     universe = meta.get("universe", [])
 
     assert len(universe) == len(asset_ctxs), "universe 与 asset_ctxs 长度不一致（不应发生）"
 
-    # 允许列表：统一转成 set，O(1) 判断
-    allowed_set = set(allowed_symbols) if allowed_symbols is not None else None
-
     asset_map: Dict[str, PerpAssetInfo] = {}
 
     # 2) 按 index 对齐构建资产字典
@@ -181,25 +198,26 @@ def build_perp_asset_map(
             only_isolated=u.get("onlyIsolated", False),
 
             # Pricing / risk anchors
-            mark_price=safe_decimal(ctx.get("markPx")),
-            mid_price=safe_decimal(ctx.get("midPx")),
-            oracle_price=safe_decimal(ctx.get("oraclePx")),
-            prev_day_price=safe_decimal(ctx.get("prevDayPx")),
+            mark_price=safe_float(ctx.get("markPx")),
+            mid_price=safe_float(ctx.get("midPx")),
+            oracle_price=safe_float(ctx.get("oraclePx")),
+            prev_day_price=safe_float(ctx.get("prevDayPx")),
 
             # Funding
-            funding_rate=safe_decimal(ctx.get("funding")),
-            premium=safe_decimal(ctx.get("premium")),
+            funding_rate=safe_float(ctx.get("funding")),
+            premium=safe_float(ctx.get("premium")),
 
             # Participation / activity
-            open_interest=safe_decimal(ctx.get("openInterest")),
-            day_notional_volume=safe_decimal(ctx.get("dayNtlVlm")),
+            open_interest=safe_float(ctx.get("openInterest")),
+            day_notional_volume=safe_float(ctx.get("dayNtlVlm")),
 
             # Impact
-            impact_bid=safe_decimal(impact_bid_raw),
-            impact_ask=safe_decimal(impact_ask_raw),
+            impact_bid=safe_float(impact_bid_raw),
+            impact_ask=safe_float(impact_ask_raw),
 
             # Raw ctx
             raw=ctx,
         )
 
+    _ASSET_MAP_CACHE[allowed_set] = (now, asset_map)
     return asset_map
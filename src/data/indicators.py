@@ -2,19 +2,55 @@
 技术指标计算模块
 负责计算各种技术指标（均线、MACD、RSI、ADX、布林带等）
 """
-import math
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 import pandas_ta as ta
 
 from src.tools.performance import measure_time
 
+# "cache_key:profile" -> (签名, 已算好指标的 DataFrame)
+_FACTOR_CACHE: dict[str, tuple[tuple, pd.DataFrame]] = {}
+
+
+def compute_technical_factors_cached(
+    df: pd.DataFrame, cache_key: str, profile: str = "full"
+) -> pd.DataFrame:
+    """
+    compute_technical_factors 的按时间帧缓存版本。
+
+    K 线按收盘对齐：60s 的主循环里，1h/15m 的数据大部分周期和上次完全一样。
+    缓存签名是 (最后一根 K 线时间, 行数, 尾行 OHLCV 字节)：尾根未收盘 bar
+    每个 tick 都可能被交易所修订（见 utils 的 _CANDLE_OVERLAP），签名包含
+    它的最新值，只有整帧数据与上次完全一致才复用缓存，修订即重算。
+    """
+    if len(df) == 0:
+        return compute_technical_factors(df, profile=profile)
+
+    key = f"{cache_key}:{profile}"
+    sig = (df.index[-1], len(df), df.values[-1].tobytes())
+    cached = _FACTOR_CACHE.get(key)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+
+    out = compute_technical_factors(df, profile=profile)
+    _FACTOR_CACHE[key] = (sig, out)
+    return out
+
 
 @measure_time
-def compute_technical_factors(df: pd.DataFrame) -> pd.DataFrame:
+def compute_technical_factors(df: pd.DataFrame, profile: str = "full") -> pd.DataFrame:
     """
-    计算所有技术指标并添加到 DataFrame
+    计算所有技术指标，返回带指标列的新 DataFrame
+
+    所有新列先收进 cols 字典，最后一次 df.assign 批量写入：
+    30+ 次逐列插入会反复触发 DataFrame 内部块整理，批量只整理一次。
+
+    profile:
+    - "full": 全部因子（1h/15m 决策帧）
+    - "light": 只算触发帧真正消费的核心列（均线/MACD/RSI/ADX/ATR/布林宽/量比），
+      跳过 HV/偏度/POC/结构分形等重计算段
     """
     # 基础数据
     close = df["close"]
@@ -22,117 +58,153 @@ def compute_technical_factors(df: pd.DataFrame) -> pd.DataFrame:
     low = df["low"]
     vol = df["volume"]
 
+    cols: dict = {}
+    full = profile != "light"
+
     # ==========================================
     # 1. 趋势与动量 (Trend & Momentum)
     # ==========================================
     # 均线组
-    df["ema_20"] = ta.ema(close, length=20)
-    df["sma_50"] = ta.sma(close, length=50)
-    df["ema_50"] = ta.ema(close, length=50)
-    df["wma_50"] = ta.wma(close, length=50)
+    cols["ema_20"] = ta.ema(close, length=20)
+    if full:
+        cols["sma_50"] = close.rolling(50).mean()  # 简单均线直接 rolling，不走 ta 包装
+        cols["ema_50"] = ta.ema(close, length=50)
+        cols["wma_50"] = ta.wma(close, length=50)
 
     # MACD
     macd = ta.macd(close)
-    df["macd"] = macd["MACD_12_26_9"]
-    df["macd_signal"] = macd["MACDs_12_26_9"]
-    df["macd_hist"] = macd["MACDh_12_26_9"]
+    cols["macd"] = macd["MACD_12_26_9"]
+    cols["macd_signal"] = macd["MACDs_12_26_9"]
+    cols["macd_hist"] = macd["MACDh_12_26_9"]
 
-    # 其他动能
-    df["roc_10"] = ta.roc(close, length=10)
-    df["mom_10"] = ta.mom(close, length=10)
-    df["rsi_14"] = ta.rsi(close, length=14)
+    # 其他动能（ROC/MOM 就是 pct_change/diff，直接用 pandas 等价实现）
+    if full:
+        cols["roc_10"] = close.pct_change(10) * 100
+        cols["mom_10"] = close.diff(10)
+    cols["rsi_14"] = ta.rsi(close, length=14)
 
-    # ADX
+    # ADX（adx_14 后面平滑斜率还要用，留局部变量）
     adx_df = ta.adx(high, low, close, length=14)
-    df["adx_14"] = adx_df["ADX_14"]
-    df["dmp_14"] = adx_df["DMP_14"]
-    df["dmn_14"] = adx_df["DMN_14"]
+    adx_14 = adx_df["ADX_14"]
+    cols["adx_14"] = adx_14
+    cols["dmp_14"] = adx_df["DMP_14"]
+    cols["dmn_14"] = adx_df["DMN_14"]
 
     # ==========================================
     # 2. 均值回归 (Mean Reversion)
     # ==========================================
-    # 布林带
+    # 布林带（bb_width 同样被斜率段复用）
     bbands = ta.bbands(close, length=20, lower_std=2.0, upper_std=2.0)
-    df["bb_mid"] = bbands["BBM_20_2.0_2.0"]
-    df["bb_upper"] = bbands["BBU_20_2.0_2.0"]
-    df["bb_lower"] = bbands["BBL_20_2.0_2.0"]
-    df["bb_width"] = bbands["BBB_20_2.0_2.0"]
-    df["bb_percent"] = bbands["BBP_20_2.0_2.0"]
-
-    # 肯特纳通道
-    kelt = ta.kc(high, low, close, length=20)
-    df["kc_mid"] = kelt["KCBe_20_2"]
-    df["kc_upper"] = kelt["KCUe_20_2"]
-    df["kc_lower"] = kelt["KCLe_20_2"]
-
-    # VWAP & AVWAP
-    df["vwap"] = ta.vwap(high, low, close, vol)
-    
-    # AVWAP: 全局成交量加权均价
-    cum_pv = (close * vol).cumsum()
-    cum_vol = vol.cumsum()
-    df["avwap_full"] = cum_pv / cum_vol
-
-    # Z-Score
-    mean_20 = close.rolling(20).mean()
-    std_20 = close.rolling(20).std()
-    df["zscore_20"] = (close - mean_20) / std_20
-
-    # Williams %R
-    df["williams_r"] = ta.willr(high, low, close, length=14)
+    bb_width = bbands["BBB_20_2.0_2.0"]
+    cols["bb_mid"] = bbands["BBM_20_2.0_2.0"]
+    cols["bb_upper"] = bbands["BBU_20_2.0_2.0"]
+    cols["bb_lower"] = bbands["BBL_20_2.0_2.0"]
+    cols["bb_width"] = bb_width
+    cols["bb_percent"] = bbands["BBP_20_2.0_2.0"]
+
+    if full:
+        # 肯特纳通道
+        kelt = ta.kc(high, low, close, length=20)
+        cols["kc_mid"] = kelt["KCBe_20_2"]
+        cols["kc_upper"] = kelt["KCUe_20_2"]
+        cols["kc_lower"] = kelt["KCLe_20_2"]
+
+        # VWAP & AVWAP
+        cols["vwap"] = ta.vwap(high, low, close, vol)
+
+        # AVWAP: 全局成交量加权均价
+        cum_pv = (close * vol).cumsum()
+        cum_vol = vol.cumsum()
+        cols["avwap_full"] = cum_pv / cum_vol
+
+        # Z-Score（rolling 对象绑定一次，mean/std/max/min 复用同一个窗口）
+        close_r20 = close.rolling(20)
+        mean_20 = close_r20.mean()
+        std_20 = close_r20.std()
+        cols["zscore_20"] = (close - mean_20) / std_20
+
+        # Williams %R（公式简单，直接 rolling 高低点算）
+        hh_14 = high.rolling(14).max()
+        ll_14 = low.rolling(14).min()
+        cols["williams_r"] = -100 * (hh_14 - close) / (hh_14 - ll_14)
 
     # ==========================================
     # 3. 波动率 (Volatility)
     # ==========================================
-    df["atr_14"] = ta.atr(high, low, close, length=14)
-    df["natr_14"] = df["atr_14"] / close  # 标准化ATR
+    atr_14 = ta.atr(high, low, close, length=14)
+    natr_14 = atr_14 / close  # 标准化ATR
+    cols["atr_14"] = atr_14
+    cols["natr_14"] = natr_14
 
     # NATR平滑
-    df["natr_ema"] = ta.ema(df["natr_14"], length=10)
-
-    # 历史波动率
-    log_ret = (close / close.shift(1)).apply(lambda x: math.log(x) if x > 0 else 0)
-    df["hv_20"] = log_ret.rolling(20).std()
-    df["hv_100"] = log_ret.rolling(100).std()
-    df["hv_ratio"] = df["hv_20"] / df["hv_100"]
-
-    # 分布特征
-    df["ret_skew_50"] = log_ret.rolling(50).skew()
-    df["ret_kurt_50"] = log_ret.rolling(50).kurt()
+    cols["natr_ema"] = ta.ema(natr_14, length=10)
+
+    # 放量判断（light 档也要：触发帧的量能确认用它）
+    vol_sma_20 = vol.rolling(20).mean()
+    vol_ratio = vol / vol_sma_20
+    cols["vol_sma_20"] = vol_sma_20
+    cols["vol_ratio"] = vol_ratio
+    cols["vol_spike_ratio"] = vol_ratio
+
+    # light 档到此为止：HV/偏度/结构/POC/斜率都是决策帧专属
+    if not full:
+        return df.assign(**cols)
+
+    # 历史波动率（np.log 整列向量化，替代逐元素 apply+math.log）
+    ratio = close / close.shift(1)
+    log_ret = pd.Series(
+        np.where(ratio.values > 0, np.log(np.where(ratio.values > 0, ratio.values, 1.0)), 0.0),
+        index=close.index,
+    )
+    hv_20 = log_ret.rolling(20).std()
+    hv_100 = log_ret.rolling(100).std()
+    cols["hv_20"] = hv_20
+    cols["hv_100"] = hv_100
+    cols["hv_ratio"] = hv_20 / hv_100
+
+    # 分布特征（同一个 50 窗口算 skew 和 kurt）
+    log_ret_r50 = log_ret.rolling(50)
+    cols["ret_skew_50"] = log_ret_r50.skew()
+    cols["ret_kurt_50"] = log_ret_r50.kurt()
 
     # ==========================================
     # 4. 结构与形态 (Structure & Pattern)
     # ==========================================
     # 10日高低点
-    df["swing_low_10"] = low.rolling(10).min()
-    df["swing_high_10"] = high.rolling(10).max()
-    # 20日高低点
-    df["n_high"] = close.rolling(20).max()
-    df["n_low"] = close.rolling(20).min()
+    cols["swing_low_10"] = low.rolling(10).min()
+    cols["swing_high_10"] = high.rolling(10).max()
+    # 20日高低点（复用上面的 close 20 窗口）
+    n_high = close_r20.max()
+    n_low = close_r20.min()
+    cols["n_high"] = n_high
+    cols["n_low"] = n_low
 
     # 突破判断
-    df["breakout_up"] = close.gt(df["n_high"].shift(1)).astype("int8")
-    df["breakout_down"] = close.lt(df["n_low"].shift(1)).astype("int8")
-    
-    # 分形高低点
-    df["swing_high_fractal"] = high[(high.shift(1) < high) & (high.shift(-1) < high)]
-    df["swing_low_fractal"] = low[(low.shift(1) > low) & (low.shift(-1) > low)]
+    breakout_up = close.gt(n_high.shift(1)).astype("int8")
+    cols["breakout_up"] = breakout_up
+    cols["breakout_down"] = close.lt(n_low.shift(1)).astype("int8")
+
+    # 分形高低点（numpy 布尔掩码，省掉两次 shift 产生的临时 Series）
+    h = high.values
+    l = low.values
+    hi_mask = np.zeros(len(h), dtype=bool)
+    lo_mask = np.zeros(len(l), dtype=bool)
+    if len(h) >= 3:
+        hi_mask[1:-1] = (h[:-2] < h[1:-1]) & (h[2:] < h[1:-1])
+        lo_mask[1:-1] = (l[:-2] > l[1:-1]) & (l[2:] > l[1:-1])
+    cols["swing_high_fractal"] = np.where(hi_mask, h, np.nan)
+    cols["swing_low_fractal"] = np.where(lo_mask, l, np.nan)
 
     # ==========================================
     # 5. 价量分析 (Volume)
     # ==========================================
-    # 放量判断
-    df["vol_sma_20"] = ta.sma(vol, length=20)
-    df["vol_ratio"] = vol / df["vol_sma_20"]
-    df["vol_spike_ratio"] = df["vol_ratio"]
-
     # 突破+放量
-    df["breakout_up_with_vol"] = (
-        (df["breakout_up"] == 1) & (df["vol_spike_ratio"] > 2.0)
-    ).astype(int)
+    cols["breakout_up_with_vol"] = ((breakout_up == 1) & (vol_ratio > 2.0)).astype(int)
 
-    # OBV
-    df["obv"] = ta.obv(close, vol)
+    # OBV：sign(涨跌) * 量 累加（首根按 +vol 记，与 ta.obv 一致）
+    direction = np.sign(close.diff().values)
+    direction[0] = 1.0
+    cols["obv"] = np.nancumsum(direction * vol.values)
 
     # 简易 POC (Point of Control)
     price_min = close.min()
@@ -140,26 +212,30 @@ def compute_technical_factors(df: pd.DataFrame) -> pd.DataFrame:
     if price_max > price_min:
         bins = 30
         bin_size = (price_max - price_min) / bins
-        bin_index = ((close - price_min) / bin_size).astype(int).clip(0, bins - 1)
-        vol_profile = vol.groupby(bin_index).sum()
-        poc_bin = vol_profile.idxmax()
+        # bincount 一次算完每个价格桶的成交量，替代 groupby 的哈希分组
+        bin_index = np.clip(((close.values - price_min) / bin_size).astype(np.int64), 0, bins - 1)
+        vol_profile = np.bincount(bin_index, weights=vol.values, minlength=bins)
+        poc_bin = int(vol_profile.argmax())
         poc_price = float(price_min + (poc_bin + 0.5) * bin_size)
-        df["poc_full"] = poc_price
-        df["price_to_poc_pct"] = (close - poc_price) / poc_price
+        cols["poc_full"] = poc_price
+        cols["price_to_poc_pct"] = (close - poc_price) / poc_price
     else:
-        df["poc_full"] = float("nan")
-        df["price_to_poc_pct"] = float("nan")
+        cols["poc_full"] = float("nan")
+        cols["price_to_poc_pct"] = float("nan")
 
     # ==========================================
     # 6. 环境斜率判定 (Timing Logic)
     # ==========================================
     # EMA平滑后再求Diff，否则噪音太大
+    # （直接用 pandas ewm，省掉 pandas_ta 包装层的参数解析/拷贝）
     ema_len = 10
-    df["adx_ema"] = ta.ema(df["adx_14"], length=ema_len)
-    df["bbw_ema"] = ta.ema(df["bb_width"], length=ema_len)
+    adx_ema = adx_14.ewm(span=ema_len, adjust=False).mean()
+    bbw_ema = bb_width.ewm(span=ema_len, adjust=False).mean()
+    cols["adx_ema"] = adx_ema
+    cols["bbw_ema"] = bbw_ema
 
     # 计算斜率
-    df["adx_slope"] = df["adx_ema"].diff()
-    df["bbw_slope"] = df["bbw_ema"].diff()
+    cols["adx_slope"] = adx_ema.diff()
+    cols["bbw_slope"] = bbw_ema.diff()
 
-    return df
+    return df.assign(**cols)
@@ -1,10 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from decimal import Decimal
 from enum import Enum
-from typing import Any, Literal, Dict, TYPE_CHECKING, Tuple
-from pydantic import BaseModel
+from typing import Any, List, Literal, Dict, Optional, TYPE_CHECKING, Tuple
 
 from src.tools.utils import _to_float
 
@@ -138,22 +136,23 @@ class PerpAssetInfo:
     only_isolated: bool = False  # 是否仅支持逐仓模式
 
     # Pricing / risk anchors
-    mark_price: Decimal = Decimal("0")  # 标记价格（用于计算未实现盈亏）
-    mid_price: Decimal = Decimal("0")  # 中间价（(bid + ask) / 2）
-    oracle_price: Decimal = Decimal("0")  # 预言机价格
-    prev_day_price: Decimal = Decimal("0")  # 前一日收盘价
+    # （行情快照只做展示/比较，float 足够，省掉每个字段的 Decimal 构造）
+    mark_price: float = 0.0  # 标记价格（用于计算未实现盈亏）
+    mid_price: float = 0.0  # 中间价（(bid + ask) / 2）
+    oracle_price: float = 0.0  # 预言机价格
+    prev_day_price: float = 0.0  # 前一日收盘价
 
     # Funding
-    funding_rate: Decimal = Decimal("0")  # 资金费率
-    premium: Decimal = Decimal("0")  # 溢价
+    funding_rate: float = 0.0  # 资金费率
+    premium: float = 0.0  # 溢价
 
     # Participation / activity
-    open_interest: Decimal = Decimal("0")  # 未平仓合约量（Open Interest）
-    day_notional_volume: Decimal = Decimal("0")  # 当日名义交易量
+    open_interest: float = 0.0  # 未平仓合约量（Open Interest）
+    day_notional_volume: float = 0.0  # 当日名义交易量
 
     # Microstructure / impact
-    impact_bid: Decimal = Decimal("0")  # 买盘冲击成本
-    impact_ask: Decimal = Decimal("0")  # 卖盘冲击成本
+    impact_bid: float = 0.0  # 买盘冲击成本
+    impact_ask: float = 0.0  # 卖盘冲击成本
 
     # Raw ctx for debugging/backfill (exclude from repr to keep logs clean)
     raw: Dict[str, Any] = field(default_factory=dict, repr=False)  # 原始上下文数据（用于调试/回填，repr 中不显示）
@@ -265,7 +264,7 @@ class TechnicalLinesSnapshot:
 
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Decision:
     """
     策略决策结果对象：由 decide_regime 生成
@@ -335,10 +334,10 @@ class Decision:
     # ==========================================
     # 6. 可解释性与日志 (Logging)
     # ==========================================
-    reasons: List[str] = field(default_factory=list)
+    reasons: Tuple[str, ...] = ()
     # 决策依据记录。
-    # 存储触发该决策的文本描述，例如 ["RSI超卖", "突破布林带上轨"]。
-    # 这里的 default_factory=list 是为了避免所有实例共享同一个列表。
+    # 存储触发该决策的文本描述，例如 ("RSI超卖", "突破布林带上轨")。
+    # 决策对象只读下传，元组免掉 default_factory 分配且可安全共享。
 
     # ==========================================
     # 7. 上下文快照 (Context Snapshots)
@@ -364,7 +363,7 @@ class Decision:
 # 5. Configs (配置)
 # =============================================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StrategyConfig:
     """策略配置"""
     symbol: str  # 交易对符号
@@ -377,7 +376,7 @@ class StrategyConfig:
     cooldown_bars_1m: int = 3  # 冷却时间（1分钟 K 线数量）
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExecutionConfig:
     """执行配置"""
     dry_run: bool = True  # 是否模拟运行（不实际下单）
@@ -385,14 +384,11 @@ class ExecutionConfig:
     post_only: bool = False  # 是否仅挂单（Post Only 模式）
 
 
-class RegimeState(BaseModel):
+@dataclass(slots=True)
+class RegimeState:
     """市场体制状态（用于状态机）"""
     prev_base: MarketRegime = MarketRegime.UNKNOWN  # 上一个市场体制状态
 
-from dataclasses import dataclass
-from enum import Enum
-from typing import List, Optional
-
 class Side(str, Enum):
     """交易方向枚举"""
     LONG = "LONG"  # 做多
@@ -400,14 +396,14 @@ class Side(str, Enum):
     # FLAT = "FLAT"  # 明确的空仓信号
     NONE = "NONE"  # 无方向 结构方向存在，但当前价格位置 / 动能 / 波动 / 环境不支持高性价比入场，因此选择观望
 
-@dataclass
+@dataclass(slots=True)
 class DirectionResult:
     """方向判断结果"""
     side: Side  # 交易方向（LONG/SHORT/NONE）
     confidence: float  # 置信度，范围 0~1
     reasons: List[str]  # 判断依据列表
 
-@dataclass
+@dataclass(slots=True)
 class TriggerResult:
     """触发判断结果"""
     entry_ok: bool  # 是否满足入场条件
@@ -416,7 +412,7 @@ class TriggerResult:
     is_breakout: Optional[bool]  # 是否为突破类型触发
     reasons: List[str]  # 判断依据列表
 
-@dataclass
+@dataclass(slots=True)
 class ValidityResult:
     """有效性判断结果"""
     stop_price: Optional[float]  # 止损价格
@@ -426,7 +422,7 @@ class ValidityResult:
     reasons: List[str]  # 判断依据列表
 
 
-@dataclass
+@dataclass(slots=True)
 class SignalSnapshot:
     side: Side
     entry_ok: bool
@@ -440,7 +436,7 @@ class SignalSnapshot:
     ttl_seconds: int
     created_ts: float
 
-@dataclass
+@dataclass(slots=True)
 class TradePlan:
     """交易计划（新版本）"""
     action: Literal["OPEN", "CLOSE", "FLIP", "NONE"]  # 交易动作
@@ -465,7 +461,7 @@ class TradePlan:
 
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CumFunding:
     """累计资金费率"""
     all_time: Optional[float]  # 历史累计资金费（从账户创建开始）
@@ -475,14 +471,17 @@ class CumFunding:
     @staticmethod
     def from_dict(d: Optional[Dict[str, Any]]) -> "CumFunding":
         d = d or {}
+        # 局部名绑定：与 PerpPosition.from_dict 同款，省掉逐字段的全局查找
+        g = d.get
+        f = _to_float
         return CumFunding(
-            all_time=_to_float(d.get("allTime")),
-            since_change=_to_float(d.get("sinceChange")),
-            since_open=_to_float(d.get("sinceOpen")),
+            all_time=f(g("allTime")),
+            since_change=f(g("sinceChange")),
+            since_open=f(g("sinceOpen")),
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LeverageInfo:
     """杠杆信息"""
     type: Optional[Literal["cross", "isolated"]]  # 杠杆类型：cross=全仓，isolated=逐仓
@@ -502,7 +501,14 @@ class LeverageInfo:
         return LeverageInfo(type=None, value=_to_float(v))
 
 
-@dataclass
+# PerpPosition.from_dict 里需要按 float 解析的原始字段（一次遍历统一转换）
+_PERP_FLOAT_FIELDS = (
+    "entryPx", "liquidationPx", "marginUsed", "maxLeverage",
+    "szi", "positionValue", "unrealizedPnl", "returnOnEquity",
+)
+
+
+@dataclass(slots=True)
 class PerpPosition:
     """永续合约仓位信息"""
 
@@ -560,24 +566,29 @@ class PerpPosition:
         coin = d.get("coin")
         coin = str(coin)
 
+        # 数值字段统一走一次遍历转换，避免逐字段重复 _to_float 调用链
+        g = d.get
+        f = _to_float
+        vals = {k: f(g(k)) for k in _PERP_FLOAT_FIELDS}
+
         return PerpPosition(
             coin=coin,
-            cum_funding=CumFunding.from_dict(d.get("cumFunding")),
-            entry_px=_to_float(d.get("entryPx")),
-            liquidation_px=_to_float(d.get("liquidationPx") ),
-            margin_used=_to_float(d.get("marginUsed")),
-            max_leverage=_to_float(d.get("maxLeverage")),
-            szi=_to_float(d.get("szi")),
-            position_value=_to_float(d.get("positionValue")),
-            unrealized_pnl=_to_float(d.get("unrealizedPnl") ),
-            return_on_equity=_to_float(d.get("returnOnEquity") ),
-            leverage=LeverageInfo.from_any(d.get("leverage")),
+            cum_funding=CumFunding.from_dict(g("cumFunding")),
+            entry_px=vals["entryPx"],
+            liquidation_px=vals["liquidationPx"],
+            margin_used=vals["marginUsed"],
+            max_leverage=vals["maxLeverage"],
+            szi=vals["szi"],
+            position_value=vals["positionValue"],
+            unrealized_pnl=vals["unrealizedPnl"],
+            return_on_equity=vals["returnOnEquity"],
+            leverage=LeverageInfo.from_any(g("leverage")),
             raw=d,
             orders=None
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MarginSummary:
     """保证金汇总"""
     account_value: Optional[float]  # 账户总价值（权益，USDC）
@@ -587,16 +598,28 @@ class MarginSummary:
 
     @staticmethod
     def from_dict(d: Optional[Dict[str, Any]]) -> "MarginSummary":
-        d = d or {}
+        # 空输入直接复用单例（frozen，天然可共享），不重复构造全 None 对象
+        if not d:
+            return _EMPTY_MARGIN_SUMMARY
+        g = d.get
+        f = _to_float
         return MarginSummary(
-            account_value=_to_float(d.get("accountValue")),
-            total_margin_used=_to_float(d.get("totalMarginUsed")),
-            total_ntl_pos=_to_float(d.get("totalNtlPos")),
-            total_raw_usd=_to_float(d.get("totalRawUsd")),
+            account_value=f(g("accountValue")),
+            total_margin_used=f(g("totalMarginUsed")),
+            total_ntl_pos=f(g("totalNtlPos")),
+            total_raw_usd=f(g("totalRawUsd")),
         )
 
 
-@dataclass(frozen=True)
+_EMPTY_MARGIN_SUMMARY = MarginSummary(
+    account_value=None,
+    total_margin_used=None,
+    total_ntl_pos=None,
+    total_raw_usd=None,
+)
+
+
+@dataclass(frozen=True, slots=True)
 class AccountState:
     """账户状态"""
     time_ms: Optional[int]  # 服务器时间戳（毫秒）
@@ -606,7 +629,7 @@ class AccountState:
     margin_summary: MarginSummary  # 保证金汇总（通常等同 cross_margin_summary）
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AccountOverview:
     """
     fetch_account_overview 的强类型返回值
@@ -616,8 +639,9 @@ class AccountOverview:
     primary_position: Optional[PerpPosition]  # 主要交易币种的仓位（如果存在）
     open_orders: List[Dict[str, Any]]  # 挂单列表（这里先保留 dict，因为订单结构更复杂/变化更多）
     raw_user_state: Dict[str, Any]  # 原始用户状态字典（用于调试/兼容）
+    positions_by_coin: Optional[Dict[str, PerpPosition]] = None  # coin -> 仓位索引，O(1) 查找
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TriggerOrder:
     """触发订单（条件单）"""
     coin: str  # 交易币种
@@ -631,7 +655,7 @@ class TriggerOrder:
     raw: Dict[str, Any]  # 原始数据字典
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NormalOrder:
     """普通订单（限价/市价单）"""
     coin: str  # 交易币种
@@ -641,7 +665,7 @@ class NormalOrder:
     timestamp: Optional[int]  # 时间戳
     raw: Dict[str, Any]  # 原始数据字典
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PositionTpsl:
     """内嵌到仓位对象里：按 entryPx + 方向归类后的 TP/SL"""
     tp: Tuple[TriggerOrder, ...]  # 止盈单列表
@@ -649,7 +673,7 @@ class PositionTpsl:
     others: Tuple[TriggerOrder, ...]  # 同 coin 的触发单，但无法判定 TP/SL（缺价/缺entry等）
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PositionOrders:
     """你也可以不要 normal，只放 tpsl；我这里给全一点便于调试"""
     tpsl: PositionTpsl  # 止盈止损订单信息
@@ -132,7 +132,7 @@ def decide_regime(
             allow_trend=False, allow_mean=False,
             allow_new_entry=False, allow_manage=True,
             risk_scale=0.0, cooldown_scale=2.0,
-            reasons=hard_reasons,
+            reasons=tuple(hard_reasons),
             adx=adx, vol_state=vol_state, order_book=order_book
         )
 
@@ -215,7 +215,7 @@ def decide_regime(
 
     # 软拒绝检查
     if soft_reasons:
-        all_reasons = soft_reasons + gate_logs
+        all_reasons = tuple(soft_reasons + gate_logs)
         return Decision(
             action=Action.NO_NEW_ENTRY,
             regime=base,
@@ -229,7 +229,7 @@ def decide_regime(
 
     # 僵尸状态检查 (Logic Filter 导致无策略可用)
     if not allow_trend and not allow_mean:
-        failure_reasons = gate_logs if gate_logs else ["logic gap: no strategy fits"]
+        failure_reasons = tuple(gate_logs) if gate_logs else ("logic gap: no strategy fits",)
         return Decision(
             action=Action.NO_NEW_ENTRY,
             strict_entry=False,
@@ -254,7 +254,7 @@ def decide_regime(
         allow_manage=True,
         risk_scale=risk_scale,
         cooldown_scale=cooldown_scale,
-        reasons=[f"ok: regime={base.name}"],
+        reasons=(f"ok: regime={base.name}",),
         adx=adx,
         vol_state=vol_state,
         order_book=order_book
@@ -32,13 +32,13 @@ def compute_direction(df_1h: pd.DataFrame, regime: Decision) -> DirectionResult:
     if len(df_1h) < 2:
         return DirectionResult(side=Side.NONE, confidence=0.0, reasons=["1h: insufficient bars (<2)"])
 
-    close = float(df_1h["close"].iloc[-1])
-    ema20 = float(df_1h["ema_20"].iloc[-1])
-    ema50 = float(df_1h["ema_50"].iloc[-1])
-    adx = float(df_1h["adx_14"].iloc[-1])
+    close = float(df_1h["close"].values[-1])
+    ema20 = float(df_1h["ema_20"].values[-1])
+    ema50 = float(df_1h["ema_50"].values[-1])
+    adx = float(df_1h["adx_14"].values[-1])
 
     # slope (safe)
-    ema20_prev = float(df_1h["ema_20"].iloc[-2])
+    ema20_prev = float(df_1h["ema_20"].values[-2])
     #算出 EMA20 这一小时比上一小时变动了多少比例
     slope_pct = (ema20 - ema20_prev) / ema20_prev if ema20_prev not in (0.0, None) else 0.0
 
@@ -196,16 +196,16 @@ def compute_trigger(df_15m: pd.DataFrame, dir_res: DirectionResult, regime: Deci
     strict_entry = regime.strict_entry
 
     # -------- 2) Latest bar data --------
-    open_ = float(df_15m["open"].iloc[-1])
-    high = float(df_15m["high"].iloc[-1])
-    low = float(df_15m["low"].iloc[-1])
-    close = float(df_15m["close"].iloc[-1])
+    open_ = float(df_15m["open"].values[-1])
+    high = float(df_15m["high"].values[-1])
+    low = float(df_15m["low"].values[-1])
+    close = float(df_15m["close"].values[-1])
 
-    prev_close = float(df_15m["close"].iloc[-2])
+    prev_close = float(df_15m["close"].values[-2])
 
-    ema20 = float(df_15m["ema_20"].iloc[-1])
-    ema50 = float(df_15m["ema_50"].iloc[-1])
-    atr = float(df_15m["atr_14"].iloc[-1])
+    ema20 = float(df_15m["ema_20"].values[-1])
+    ema50 = float(df_15m["ema_50"].values[-1])
+    atr = float(df_15m["atr_14"].values[-1])
 
     if atr <= 0:
         return TriggerResult(False, None, 0.0, False, ["15m: ATR invalid (<=0)"])
@@ -321,10 +321,10 @@ def compute_validity_and_risk(
 
     strict = bool(regime.strict_entry)
 
-    close15 = float(df_15m["close"].iloc[-1])
-    ema20_15 = float(df_15m["ema_20"].iloc[-1])
-    ema50_15 = float(df_15m["ema_50"].iloc[-1])
-    atr15 = float(df_15m["atr_14"].iloc[-1])
+    close15 = float(df_15m["close"].values[-1])
+    ema20_15 = float(df_15m["ema_20"].values[-1])
+    ema50_15 = float(df_15m["ema_50"].values[-1])
+    atr15 = float(df_15m["atr_14"].values[-1])
     if atr15 <= 0:
         return ValidityResult(None, False, False, 0.0, ["15m: ATR invalid (<=0)"])
 
@@ -353,8 +353,8 @@ def compute_validity_and_risk(
             is_breakout = ("breakout" in rs) or ("breakdown" in rs)
 
         N = 10
-        swing_low = float(df_15m["low"].iloc[-N:].min())
-        swing_high = float(df_15m["high"].iloc[-N:].max())
+        swing_low = float(df_15m["low"].values[-N:].min())
+        swing_high = float(df_15m["high"].values[-N:].max())
 
         if dir_res.side == Side.LONG:
             atr_sl = entry_ref - atr_dist
@@ -376,8 +376,8 @@ def compute_validity_and_risk(
         quality = 0.70
         if df_5m is not None and len(df_5m) >= 6 and "atr_14" in df_5m.columns:
             last = df_5m.iloc[-3:]
-            drift = float(last["close"].iloc[-1] - last["close"].iloc[0])
-            atr5 = float(df_5m["atr_14"].iloc[-1])
+            drift = float(last["close"].values[-1] - last["close"].values[0])
+            atr5 = float(df_5m["atr_14"].values[-1])
             if atr5 > 0:
                 if dir_res.side == Side.LONG and drift < -0.35 * atr5:
                     quality -= 0.30
@@ -416,8 +416,8 @@ def compute_validity_and_risk(
 
     exit_ok = False
     N = 10
-    swing_low = float(df_15m["low"].iloc[-N:].min())
-    swing_high = float(df_15m["high"].iloc[-N:].max())
+    swing_low = float(df_15m["low"].values[-N:].min())
+    swing_high = float(df_15m["high"].values[-N:].max())
 
     if pos_side == Side.LONG:
         if close15 < (swing_low - 0.05 * atr15): exit_ok = True
@@ -436,7 +436,7 @@ def compute_validity_and_risk(
         hh = float(window["high"].max())
         ll = float(window["low"].min())
         pad = 0.15 * atr15
-        prev_close = float(df_15m["close"].iloc[-2])
+        prev_close = float(df_15m["close"].values[-2])
 
         if pos_side == Side.LONG:
             if exit_ok and (ema20_15 <= ema50_15) and (prev_close > (ll - pad)) and (close15 <= (ll - pad)):
@@ -448,8 +448,8 @@ def compute_validity_and_risk(
     quality = 0.65
     if df_5m is not None and len(df_5m) >= 6 and "atr_14" in df_5m.columns:
         last = df_5m.iloc[-3:]
-        drift = float(last["close"].iloc[-1] - last["close"].iloc[0])
-        atr5 = float(df_5m["atr_14"].iloc[-1])
+        drift = float(last["close"].values[-1] - last["close"].values[0])
+        atr5 = float(df_5m["atr_14"].values[-1])
         if atr5 > 0:
             if pos_side == Side.LONG and drift < -0.40 * atr5:
                 quality -= 0.20
@@ -524,11 +524,6 @@ def build_signal(
     )
 
 
-from typing import List, Optional
-import pandas as pd
-
-
-
 def _clamp(x: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, x))
 
@@ -568,10 +563,10 @@ def compute_mean_direction(
         return DirectionResult(side=Side.NONE, confidence=0.0,
                                reasons=reasons + [f"15m: insufficient bars (<{min_len})"])
 
-    close = float(df_15m["close"].iloc[-1])
-    ema20 = float(df_15m["ema_20"].iloc[-1])
-    ema50 = float(df_15m["ema_50"].iloc[-1])
-    atr = float(df_15m["atr_14"].iloc[-1])
+    close = float(df_15m["close"].values[-1])
+    ema20 = float(df_15m["ema_20"].values[-1])
+    ema50 = float(df_15m["ema_50"].values[-1])
+    atr = float(df_15m["atr_14"].values[-1])
 
     if atr <= 0:
         return DirectionResult(side=Side.NONE, confidence=0.0,
@@ -582,16 +577,16 @@ def compute_mean_direction(
     for k in range(cfg.range_score_confirm_bars):
         idx = -1 - k
 
-        ema20_k = float(df_15m["ema_20"].iloc[idx])
-        ema50_k = float(df_15m["ema_50"].iloc[idx])
-        atr_k = float(df_15m["atr_14"].iloc[idx])
+        ema20_k = float(df_15m["ema_20"].values[idx])
+        ema50_k = float(df_15m["ema_50"].values[idx])
+        atr_k = float(df_15m["atr_14"].values[idx])
         if atr_k <= 0:
             continue
 
         gap_to_atr = abs(ema20_k - ema50_k) / atr_k
 
         back = 4
-        ema50_prev = float(df_15m["ema_50"].iloc[idx - back])
+        ema50_prev = float(df_15m["ema_50"].values[idx - back])
         ema50_slope = (ema50_k - ema50_prev) / back
         slope_to_atr = abs(ema50_slope) / atr_k
 
@@ -612,7 +607,7 @@ def compute_mean_direction(
                                reasons=reasons + ["mean: not range-like -> skip"])
 
     # ========= 2) Squeeze 过滤（BBW 分位数） =========
-    bbw = float(df_15m["bb_width"].iloc[-1])
+    bbw = float(df_15m["bb_width"].values[-1])
     qv = _rolling_quantile(df_15m["bb_width"], cfg.bbw_lookback, cfg.bbw_q)
     if qv is not None and bbw <= qv:
         reasons.append(f"mean: squeeze bb_width={bbw:.4f} <= q{cfg.bbw_q:.2f}({qv:.4f})")
@@ -632,10 +627,10 @@ def compute_mean_direction(
                                reasons=reasons + ["mean: near Donchian low -> breakdown risk"])
 
     # ========= 4) 动态 Anchor（EMA50 + VWAP/BBMid 融合） =========
-    vwap = float(df_15m["vwap"].iloc[-1])
-    bbmid = float(df_15m["bb_mid"].iloc[-1])
+    vwap = float(df_15m["vwap"].values[-1])
+    bbmid = float(df_15m["bb_mid"].values[-1])
 
-    ema50_prev4 = float(df_15m["ema_50"].iloc[-5])
+    ema50_prev4 = float(df_15m["ema_50"].values[-5])
     slope_to_atr_now = abs((ema50 - ema50_prev4) / 4.0) / atr
     trendiness = _smoothstep(slope_to_atr_now, cfg.slope_ok, cfg.slope_bad)
     w_ema = 0.55 + 0.35 * trendiness  # 0.55~0.90
@@ -679,7 +674,7 @@ def compute_mean_direction(
     reasons.append(f"mean: align_weight x{align:.2f}")
 
     # ========= 8) 1h ADX 平滑惩罚 =========
-    adx_1h = float(df_1h["adx_14"].iloc[-1])
+    adx_1h = float(df_1h["adx_14"].values[-1])
     t = _smoothstep(adx_1h, cfg.adx_soft, cfg.adx_strong)
     penalty = 1.0 - cfg.adx_penalty_max * t
     conf *= penalty
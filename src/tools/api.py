@@ -1,6 +1,8 @@
+import functools
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Optional
 
 import httpx
 import pytz
@@ -43,13 +45,28 @@ def is_in_discount_period():
     return start_time <= beijing_now <= end_time
 
 
+# LLM 调用走独立线程池：不阻塞 start_trade 主流程
+_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+_client: Optional[OpenAI] = None
+
+
+def _get_client() -> OpenAI:
+    """OpenAI 客户端只构建一次（复用底层 HTTP 连接池），不要每次调用都重建"""
+    global _client
+    if _client is None:
+        load_dotenv()
+        _client = OpenAI(api_key=os.getenv("DEEPSEEK_API_KEY"), base_url="https://api.deepseek.com/v1")
+    return _client
+
+
+@functools.lru_cache(maxsize=256)
 def call_deepseek(
         prompt: str,
         user_message: str,
 
 ) -> Any:
-    load_dotenv()
-    client = OpenAI(api_key=os.getenv("DEEPSEEK_API_KEY"), base_url="https://api.deepseek.com/v1")
+    client = _get_client()
 
     model = "deepseek-chat"
     if is_in_discount_period():
@@ -79,6 +96,15 @@ def call_deepseek(
     return resp
 
 
+def submit_deepseek(prompt: str, user_message: str) -> "Future[Any]":
+    """
+    异步提交 DeepSeek 调用，立即返回 Future：
+    调用方在真正需要决策时再 fut.result(timeout=...)，
+    避免 1~10s 的 LLM 请求阻塞交易主循环。
+    """
+    return _EXECUTOR.submit(call_deepseek, prompt, user_message)
+
+
 if __name__ == '__main__':
     prompt = """你是一个加密货币交易专家，专注于分析市场趋势并提供交易建议。根据用户提供的市场数据和信息，做出以下决策：
                 1. 如果市场显示出明显的上涨趋势，建议 "long"（做多）。
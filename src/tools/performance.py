@@ -3,24 +3,30 @@
 提供性能分析相关的工具函数和装饰器
 """
 import functools
+import os
 import time
 
+# 只有显式开启 PROFILE=1 时才注入计时包装，生产路径保持裸函数调用
+_PROFILE = os.environ.get("PROFILE") == "1"
+
 
 def measure_time(func):
     """
     一个简单的装饰器，用于打印函数执行耗时
-    
-    只有耗时超过 10 秒的函数才会打印，避免刷屏
+
+    默认（未开启 PROFILE）直接返回原函数，零额外开销；
+    PROFILE=1 时包一层计时，只有耗时超过 10 秒的函数才会打印，避免刷屏
     """
+    if not _PROFILE:
+        return func
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         start_time = time.perf_counter()  # 比 time.time() 精度更高
         try:
-            result = func(*args, **kwargs)
-            return result
+            return func(*args, **kwargs)
         finally:
-            end_time = time.perf_counter()
-            elapsed = end_time - start_time
+            elapsed = time.perf_counter() - start_time
             # 只有耗时超过 10 秒才打印，避免刷屏
             if elapsed > 10:
                 print(f"⏱️ [{func.__name__}] 耗时: {elapsed:.4f} 秒")
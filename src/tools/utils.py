@@ -26,6 +26,12 @@ TIMEFRAME_MS: dict[str, int] = {
 
 
 
+# (name, interval) -> 按开盘时间升序缓存的 K 线，用于增量刷新
+_CANDLE_CACHE: dict[tuple[str, str], list[dict[str, Any]]] = {}
+# 重叠拉取的 K 线根数：覆盖交易所对尾部 K 线的修订/补全
+_CANDLE_OVERLAP = 2
+
+
 @measure_time
 def candles_last_n_closed(
     info: Any,
@@ -40,17 +46,41 @@ def candles_last_n_closed(
     "1m", "3m", "5m", "15m", "30m", "1h", "2h", "4h", "8h", "12h", "1d", "3d", "1w", "1M"
     safety_ms: shift endTime backwards to avoid partially formed candle.
                Typical: 60_000~120_000 (1~2 minutes).
+
+    已收盘的历史 K 线不会再变，所以按 (name, interval) 缓存上一次的结果，
+    之后只增量拉取缓存末尾之后的区间（带 _CANDLE_OVERLAP 根重叠，覆盖
+    尾部修订），避免每个周期都重新下载整整 500 根。
     """
     if timeframe_ms is None:
         timeframe_ms = TIMEFRAME_MS
     if interval not in timeframe_ms:
         raise ValueError(f"Unknown interval={interval!r}. Known: {sorted(timeframe_ms.keys())}")
 
+    tf_ms = timeframe_ms[interval]
     now_ms = int(time.time() * 1000)
     end_ms = now_ms - int(safety_ms)
-    start_ms = end_ms - timeframe_ms[interval] * int(limit)
-    #"1m", "3m", "5m", "15m", "30m", "1h", "2h", "4h", "8h", "12h", "1d", "3d", "1w", "1M"
-    return info.candles_snapshot(name=name, interval=interval, startTime=start_ms, endTime=end_ms)
+    start_ms = end_ms - tf_ms * int(limit)
+
+    key = (name, interval)
+    cached = _CANDLE_CACHE.get(key)
+    if cached and int(cached[-1]["t"]) >= start_ms:
+        # 增量刷新：只拉缓存末尾附近到 end_ms 的部分
+        fetch_start = int(cached[-1]["t"]) - _CANDLE_OVERLAP * tf_ms
+        fresh = info.candles_snapshot(name=name, interval=interval, startTime=fetch_start, endTime=end_ms)
+        merged = {int(c["t"]): c for c in cached}
+        for c in fresh or []:
+            merged[int(c["t"])] = c
+        candles = [merged[t] for t in sorted(merged)]
+    else:
+        # 全量拉取（首次调用 / 缓存太旧覆盖不到请求窗口）
+        candles = list(
+            info.candles_snapshot(name=name, interval=interval, startTime=start_ms, endTime=end_ms) or []
+        )
+
+    # 只保留请求窗口内的 K 线，并缓存供下次增量刷新
+    candles = [c for c in candles if start_ms <= int(c["t"]) <= end_ms]
+    _CANDLE_CACHE[key] = candles
+    return candles
 
 
 def hl_candles_to_ohlcv_list(candles: Iterable[dict[str, Any]]) -> list[list[float]]:
@@ -60,19 +90,11 @@ def hl_candles_to_ohlcv_list(candles: Iterable[dict[str, Any]]) -> list[list[flo
     Output row format: [timestamp_ms, open, high, low, close, volume]
     timestamp uses candle["t"] (open time).
     """
-    out: list[list[float]] = []
-    for x in candles:
-        out.append(
-            [
-                int(x["t"]),
-                float(x["o"]),
-                float(x["h"]),
-                float(x["l"]),
-                float(x["c"]),
-                float(x["v"]),
-            ]
-        )
-    return out
+    # 列表推导一次建完：比逐根 append 少一轮方法查找/调用
+    return [
+        [int(x["t"]), float(x["o"]), float(x["h"]), float(x["l"]), float(x["c"]), float(x["v"])]
+        for x in candles
+    ]
 
 
 
@@ -95,8 +117,19 @@ def estimate_qty_from_notional(notional: float, price: float) -> float:
         return 0.0
     return notional / price
 
-def _to_float(x) -> Optional[float]:
+def _to_float_slow(x) -> Optional[float]:
+    # 慢路径：str / int / Decimal 等少数情况才走 try/except
     try:
-        return float(x) if x is not None else None
+        return float(x)
     except Exception:
-        return None
\ No newline at end of file
+        return None
+
+
+def _to_float(x) -> Optional[float]:
+    # 快路径：绝大多数输入就是 float / None，判类型直接返回；
+    # try/except 挪到 _to_float_slow，热函数本体不带异常处理
+    if type(x) is float:
+        return x
+    if x is None:
+        return None
+    return _to_float_slow(x)
\ No newline at end of file